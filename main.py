@@ -1,45 +1,291 @@
+import queue
 import sqlite3
+import string
+import threading
+import traceback
+from contextlib import contextmanager
 import tkinter as tk
 from tkinter import messagebox, ttk
 from datetime import date
+from functools import partial
+
+DB_PATH = "library.db"
+PAGE_SIZE = 200 # Rows fetched per page by the paged tables
+SEARCH_DELAY_MS = 250 # Pause in typing before the book search runs
+REFRESH_DELAY_MS = 200 # Quiet time after the last "Refresh List" click before reloading
+DB_POLL_MS = 50 # How often the Tk loop picks up finished background DB jobs
+
+# Tuned for a single-writer desktop app. journal_mode=WAL is stored in the file;
+# the others are per-connection, so every connection we open applies them all.
+PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-64000",
+    "mmap_size=268435456",
+    "foreign_keys=ON",
+)
+
+# --- SQL used by the pages ---
+# Kept as module constants so every call passes the same string and hits the
+# connection's prepared-statement cache instead of re-parsing the SQL.
+SQL_INSERT_BOOK = "INSERT INTO books (title, author, quantity) VALUES (?, ?, ?)"
+SQL_UPDATE_BOOK = "UPDATE books SET title = ?, author = ?, quantity = ? WHERE id = ?"
+SQL_DELETE_BOOK = "DELETE FROM books WHERE id = ?"
+# Sorting by title COLLATE NOCASE lets idx_books_title serve the ORDER BY;
+# id breaks ties between equal titles so pages never overlap or skip rows.
+# Later pages start after the last (title, id) shown, an index seek rather than
+# an OFFSET that re-reads every earlier row; the title >= ? half is what lets
+# SQLite seek, the OR half drops the rows at the seam it has already shown
+SQL_BOOKS_PAGE = "SELECT * FROM books ORDER BY title COLLATE NOCASE, id LIMIT ?"
+SQL_BOOKS_PAGE_AFTER = ("SELECT * FROM books "
+                        "WHERE title >= ? COLLATE NOCASE AND (title > ? COLLATE NOCASE OR id > ?) "
+                        "ORDER BY title COLLATE NOCASE, id LIMIT ?")
+# Searches only filter with LIKE; the unary + keeps SQLite from turning a
+# prefix LIKE into its own index range, which would start every page at the
+# first match instead of after the last row shown. A prefix search bounds the
+# seek with prefix_bounds() instead, so it stops at the last possible match.
+SQL_BOOKS_SEARCH_PAGE = ("SELECT * FROM books WHERE +title LIKE ? ESCAPE '\\' "
+                         "ORDER BY title COLLATE NOCASE, id LIMIT ?")
+SQL_BOOKS_SEARCH_PAGE_AFTER = ("SELECT * FROM books WHERE +title LIKE ? ESCAPE '\\' "
+                               "AND title >= ? COLLATE NOCASE AND (title > ? COLLATE NOCASE OR id > ?) "
+                               "ORDER BY title COLLATE NOCASE, id LIMIT ?")
+SQL_BOOKS_PREFIX_PAGE = ("SELECT * FROM books WHERE +title LIKE ? ESCAPE '\\' "
+                         "AND title >= ? COLLATE NOCASE AND title < ? COLLATE NOCASE "
+                         "ORDER BY title COLLATE NOCASE, id LIMIT ?")
+SQL_BOOKS_PREFIX_PAGE_AFTER = ("SELECT * FROM books WHERE +title LIKE ? ESCAPE '\\' "
+                               "AND title >= ? COLLATE NOCASE AND (title > ? COLLATE NOCASE OR id > ?) "
+                               "AND title < ? COLLATE NOCASE "
+                               "ORDER BY title COLLATE NOCASE, id LIMIT ?")
+SQL_BOOK_ROW = "SELECT title, author, quantity FROM books WHERE id = ?"
+# (currently issued?, quantity) in one round-trip; quantity is NULL if the book is gone
+SQL_BOOK_STATUS = ("SELECT EXISTS(SELECT 1 FROM issued_books WHERE book_id = ? AND return_date IS NULL), "
+                   "(SELECT quantity FROM books WHERE id = ?)")
+
+# Availability check and decrement in one atomic statement; no row back means
+# the book is missing or has no copies left
+SQL_TAKE_COPY = "UPDATE books SET quantity = quantity - 1 WHERE id = ? AND quantity > 0 RETURNING quantity"
+SQL_BOOK_EXISTS = "SELECT 1 FROM books WHERE id = ?"
+SQL_FIND_STUDENT = "SELECT id, name FROM students WHERE roll_no = ?"
+# Creates the student, or hands back the existing one untouched (the no-op
+# DO UPDATE is what lets RETURNING report a row that was already there)
+SQL_UPSERT_STUDENT = ("INSERT INTO students (name, roll_no) VALUES (?, ?) "
+                      "ON CONFLICT(roll_no) DO UPDATE SET name = students.name RETURNING id, name")
+SQL_ALREADY_ISSUED = ("SELECT 1 FROM issued_books "
+                      "WHERE book_id = ? AND student_id = ? AND return_date IS NULL LIMIT 1")
+SQL_INSERT_ISSUE = "INSERT INTO issued_books (book_id, student_id, issue_date) VALUES (?, ?, ?)"
+
+# Oldest issue date first (newest issue first within a day: idx_issued_date read
+# backwards), keyset-paged like the history below
+SQL_ACTIVE_ISSUES = """
+    SELECT i.id, b.title, s.name, s.roll_no, i.issue_date, i.book_id
+    FROM issued_books i
+    JOIN books b ON i.book_id = b.id
+    JOIN students s ON i.student_id = s.id
+    WHERE i.return_date IS NULL
+    ORDER BY i.issue_date, i.id DESC LIMIT ?
+"""
+SQL_ACTIVE_ISSUES_AFTER = """
+    SELECT i.id, b.title, s.name, s.roll_no, i.issue_date, i.book_id
+    FROM issued_books i
+    JOIN books b ON i.book_id = b.id
+    JOIN students s ON i.student_id = s.id
+    WHERE i.return_date IS NULL
+      AND i.issue_date >= ? AND (i.issue_date > ? OR i.id < ?)
+    ORDER BY i.issue_date, i.id DESC LIMIT ?
+"""
+# Only closes an issue that is still open, and hands back the book to put back on the shelf
+SQL_RETURN_UPDATE_ISSUE = ("UPDATE issued_books SET return_date = ? "
+                           "WHERE id = ? AND return_date IS NULL RETURNING book_id")
+SQL_RETURN_INC_QTY = "UPDATE books SET quantity = quantity + 1 WHERE id = ?"
+
+# Newest first; same keyset paging as the book list, on idx_issued_date
+SQL_HISTORY_SELECT = "SELECT * FROM v_issue_history ORDER BY issue_date DESC, id LIMIT ?"
+SQL_HISTORY_SELECT_AFTER = ("SELECT * FROM v_issue_history "
+                            "WHERE issue_date <= ? AND (issue_date < ? OR id > ?) "
+                            "ORDER BY issue_date DESC, id LIMIT ?")
+
+def apply_pragmas(conn):
+    for pragma in PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+
+# --- Database Initialization ---
+# Stored in the file as PRAGMA user_version once SCHEMA_SQL has run;
+# bump it whenever SCHEMA_SQL changes so existing databases pick it up
+SCHEMA_VERSION = 1
+
+# The whole schema as one script and one transaction: every table, index and
+# view plus the version stamp commit together, or none of them do
+SCHEMA_SQL = f"""
+BEGIN;
+-- Book Table
+CREATE TABLE IF NOT EXISTS books(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            author TEXT NOT NULL,
+            quantity INTEGER NOT NULL
+            );
+-- NOCASE to match LIKE, so title prefix searches and the title sort use it
+CREATE INDEX IF NOT EXISTS idx_books_title ON books(title COLLATE NOCASE);
+-- student table (roll_no is UNIQUE, which already gives it an index)
+CREATE TABLE IF NOT EXISTS students(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            roll_no TEXT NOT NULL UNIQUE
+            );
+-- issue table
+CREATE TABLE IF NOT EXISTS issued_books(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id INTEGER NOT NULL,
+            student_id INTEGER NOT NULL,
+            issue_date TEXT NOT NULL,
+            return_date TEXT,
+            foreign key(book_id) REFERENCES books(id),
+            foreign key(student_id) REFERENCES students(id)
+            );
+-- issue indexes: the partial one only holds books still out, so the
+-- "already issued?" / "currently issued?" checks never touch returned rows
+CREATE INDEX IF NOT EXISTS idx_issued_active
+            ON issued_books(book_id, student_id) WHERE return_date IS NULL;
+CREATE INDEX IF NOT EXISTS idx_issued_book ON issued_books(book_id);
+CREATE INDEX IF NOT EXISTS idx_issued_student ON issued_books(student_id);
+-- Lets the history / active-issue lists read issues in date order instead of sorting
+CREATE INDEX IF NOT EXISTS idx_issued_date ON issued_books(issue_date DESC);
+-- issue history as the history page shows it; the ORDER BY stays with each
+-- query, since SQLite does not promise to keep a view's row order
+CREATE VIEW IF NOT EXISTS v_issue_history AS
+            SELECT i.id, b.title, s.name, s.roll_no, i.issue_date,
+                   COALESCE(i.return_date, '--- Not Returned ---') AS return_date
+            FROM issued_books i
+            JOIN books b ON i.book_id = b.id
+            JOIN students s ON i.student_id = s.id;
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+"""
 
-# --- Database Initialization (No Changes) ---
 def init_db():
-    conn = sqlite3.connect("library.db")
-    cur = conn.cursor()
-    # Book Table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS books(
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                author TEXT NOT NULL,
-                quantity INTEGER NOT NULL
-                )
-    """)
-    # student table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS students(
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                roll_no TEXT NOT NULL UNIQUE
-                )
-    """)
-    # issue table
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS issued_books(
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                book_id INTEGER NOT NULL,
-                student_id INTEGER NOT NULL,
-                issue_date TEXT NOT NULL,
-                return_date TEXT,
-                foreign key(book_id) REFERENCES books(id),
-                foreign key(student_id) REFERENCES students(id)
-                )
-    """)
-    conn.commit()
-    conn.close()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.cursor()
+        # An up-to-date database costs one header read, not the DDL
+        cur.execute("PRAGMA user_version")
+        if cur.fetchone()[0] != SCHEMA_VERSION:
+            cur.executescript(SCHEMA_SQL)
+        apply_pragmas(conn)
+    finally:
+        # Also on failure, which rolls back a half-run SCHEMA_SQL
+        conn.close()
     print("Database initialized successfully.")
 
+def connect_db(read_only=False):
+    """Open one of the app's long-lived connections: the shared read/write one,
+    or with read_only=True the one the background reader thread uses"""
+    # Autocommit mode: each statement commits on its own unless wrapped in BEGIN ... COMMIT
+    # Under WAL a reader never blocks the writer or waits for it
+    target, uri = (f"file:{DB_PATH}?mode=ro", True) if read_only else (DB_PATH, False)
+    conn = sqlite3.connect(target, uri=uri, isolation_level=None, check_same_thread=False,
+                           cached_statements=256)
+    apply_pragmas(conn)
+    return conn
+
+def like_escape(text):
+    """Escape LIKE wildcards so user input matches literally (use with ESCAPE '\\')"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# LIKE and NOCASE only fold ASCII letters, so str.lower() would be wrong here
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def prefix_bounds(text):
+    """(low, high) such that every title LIKE text || '%' sorts low <= title < high
+    under NOCASE; high is None if no string sorts above them all"""
+    low = text.translate(ASCII_LOWER)
+    stem = low.rstrip("\U0010ffff")
+    if not stem:
+        return low, None
+    after = ord(stem[-1]) + 1
+    if 0xD800 <= after <= 0xDFFF: # Surrogates cannot be stored; skip past them
+        after = 0xE000
+    return low, stem[:-1] + chr(after)
+
+def outcome(level, title, msg):
+    """What a background DB job hands back to the UI; level is "info" (ok), "warning" or "error" """
+    return {"ok": level == "info", "level": level, "title": title, "msg": msg}
+
+@contextmanager
+def transaction(conn):
+    """with transaction(conn): ... -- the autocommit connection's answer to `with conn:`.
+    Takes the write lock up front, commits on exit and rolls back if the block raises."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        # Including a failed COMMIT (disk full, I/O error), which can leave the
+        # transaction open: the shared connection would then refuse every later BEGIN
+        if conn.in_transaction: conn.rollback()
+        raise
+
+def import_books(conn, rows):
+    """Bulk-insert (title, author, quantity) rows with one statement and one commit"""
+    with transaction(conn):
+        conn.executemany(SQL_INSERT_BOOK, rows)
+
+# --- Color Palette ---
+BG_PRIMARY = "#2c3e50"   # Dark Slate Blue (for main menu)
+BG_CONTENT = "#ecf0f1"   # Light Gray (for content pages)
+TEXT_LIGHT = "#FFFFFF"   # White
+TEXT_DARK = "#34495e"    # Dark Gray
+TEXT_HEADER = "#3498db"  # Bright Blue (for headers)
+BTN_PRIMARY = "#3498db"  # Blue
+BTN_SUCCESS = "#2ecc71"  # Green
+BTN_DANGER = "#e74c3c"   # Red
+BTN_BACK = "#bdc3c7"     # Silver
+BTN_BACK_FG = "#2c3e50"  # Dark text for back button
+
+# style name -> options for style.configure() (one call per style)
+STYLES = {
+    '.': dict(background=BG_CONTENT, 
+              foreground=TEXT_DARK, 
+              font=('Inter', 11)),
+    'TFrame': dict(background=BG_CONTENT),
+    'Content.TFrame': dict(background=BG_CONTENT, relief='flat'),
+    'Dark.TFrame': dict(background=BG_PRIMARY), # For Main Menu
+    'TLabel': dict(background=BG_CONTENT, padding=5),
+    'Dark.TLabel': dict(background=BG_PRIMARY, foreground=TEXT_LIGHT, padding=5),
+    'Header.TLabel': dict(font=('Inter', 26, 'bold'), 
+                          foreground=TEXT_HEADER, 
+                          background=BG_CONTENT, 
+                          padding=(10, 20, 10, 10)),
+    'DarkHeader.TLabel': dict(font=('Inter', 32, 'bold'), 
+                              foreground=TEXT_LIGHT, 
+                              background=BG_PRIMARY, 
+                              padding=(10, 30)),
+    'TButton': dict(font=('Inter', 12, 'bold'), 
+                    padding=(15, 12), 
+                    width=25,
+                    background=BTN_PRIMARY, 
+                    foreground=TEXT_LIGHT),
+    'Success.TButton': dict(background=BTN_SUCCESS, foreground=TEXT_LIGHT),
+    'Danger.TButton': dict(background=BTN_DANGER, foreground=TEXT_LIGHT),
+    'Back.TButton': dict(background=BTN_BACK, foreground=BTN_BACK_FG, width=15),
+    'TEntry': dict(fieldbackground='white', 
+                   font=('Inter', 12), 
+                   padding=8),
+    'Treeview.Heading': dict(font=('Inter', 13, 'bold'), padding=10),
+    'Treeview': dict(font=('Inter', 11), 
+                     rowheight=30, 
+                     fieldbackground='white'),
+}
+
+# style name -> state-dependent options for style.map()
+STYLE_MAPS = {
+    'TButton': dict(background=[('active', '#2980b9')]), # Darker blue on hover/click
+    'Success.TButton': dict(background=[('active', '#27ae60')]),
+    'Danger.TButton': dict(background=[('active', '#c0392b')]),
+    'Back.TButton': dict(background=[('active', '#aab1b5')]),
+    'Treeview': dict(background=[('selected', BTN_PRIMARY)]), # Selected row color
+}
+
 # --- Main Application Class (Single-Page Architecture) ---
 class LibraryApp(tk.Tk):
     
@@ -50,6 +296,28 @@ class LibraryApp(tk.Tk):
         self.geometry("900x650") # Start with a larger default size
         self.minsize(700, 500)   # Set a minimum size
         
+        # --- One shared DB connection for the app's lifetime ---
+        self.conn = connect_db()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # --- Background DB workers ---
+        # Writes run on this one thread so a slow commit never freezes the window.
+        # A single worker keeps SQLite's one-writer-at-a-time model; results come
+        # back through result_queue and their callbacks run on the Tk thread.
+        self.db_queue = queue.Queue()
+        self.result_queue = queue.Queue()
+        self.db_thread = threading.Thread(target=self.db_worker,
+                                          args=(self.db_queue, self.conn), daemon=True)
+        self.db_thread.start()
+        # Table pages are fetched on a second thread with its own read-only
+        # connection, so a long list loads while the window stays responsive
+        self.read_conn = connect_db(read_only=True)
+        self.read_queue = queue.Queue()
+        self.read_thread = threading.Thread(target=self.db_worker,
+                                            args=(self.read_queue, self.read_conn), daemon=True)
+        self.read_thread.start()
+        self.poll_job = self.after(DB_POLL_MS, self.poll_db_results)
+        
         # --- Apply modern theme and custom styles ---
         self.setup_styles()
         
@@ -60,152 +328,100 @@ class LibraryApp(tk.Tk):
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
         
-        self.frames = {} # Dictionary to store all page frames
+        self.container = container
         
-        # Create and store each page frame
-        for F in (MainMenuFrame, AddBookFrame, ViewBooksFrame, IssueBookFrame, ReturnBookFrame, ViewIssuedBooksFrame):
-            frame = F(container, self)
-            self.frames[F] = frame
-            # All frames sit in the same spot; tkraise() brings one to the front
-            frame.grid(row=0, column=0, sticky="nsew") 
+        # Dictionary of all page frames; each one is only built the first time
+        # it is shown, so startup creates just the main menu
+        self.frames = {F: None for F in (MainMenuFrame, AddBookFrame, ViewBooksFrame,
+                                         IssueBookFrame, ReturnBookFrame, ViewIssuedBooksFrame)}
+        # Pages whose data changed since their last refresh(); all start stale
+        self.dirty = {F: True for F in self.frames}
             
         self.show_frame(MainMenuFrame) # Show the main menu first
         
     def show_frame(self, frame_class):
-        """Brings the requested frame to the front"""
+        """Brings the requested frame to the front, building it on first use"""
         frame = self.frames[frame_class]
-        # Call refresh method if it exists, to update data when page is shown
-        if hasattr(frame, 'refresh'):
+        if frame is None:
+            frame = frame_class(self.container, self)
+            self.frames[frame_class] = frame
+            # All frames sit in the same spot; tkraise() brings one to the front
+            frame.grid(row=0, column=0, sticky="nsew")
+        # Content pages only create their widgets the first time they are shown
+        if hasattr(frame, 'ensure_built'):
+            frame.ensure_built()
+        # Call refresh method if it exists, but only when the page's data has
+        # changed since it was last shown
+        if self.dirty[frame_class] and hasattr(frame, 'refresh'):
             frame.refresh()
+        self.dirty[frame_class] = False
         frame.tkraise()
         
+    def mark_dirty(self, *frame_classes):
+        """Make these pages refresh the next time they are shown"""
+        for frame_class in frame_classes:
+            self.dirty[frame_class] = True
+        
+    def run_db(self, fn, args=(), callback=None):
+        """Queue fn(conn, *args) on the DB worker; callback(result) later runs on the Tk thread"""
+        self.db_queue.put((fn, args, callback))
+        
+    def run_read(self, fn, args=(), callback=None):
+        """Like run_db, but on the reader thread, with the read-only connection"""
+        self.read_queue.put((fn, args, callback))
+        
+    def db_worker(self, jobs, conn):
+        while True:
+            job = jobs.get()
+            if job is None: # Sent by on_close
+                break
+            fn, args, callback = job
+            try:
+                result, error = fn(conn, *args), None
+            except Exception as e: # A bug in fn; the DB errors it expects it handles itself
+                if conn.in_transaction: conn.rollback()
+                result, error = None, e
+            self.result_queue.put((callback, result, error))
+            
+    def poll_db_results(self):
+        try:
+            while True:
+                try:
+                    callback, result, error = self.result_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if error is not None:
+                    raise error # Reported by Tk like any other callback error
+                if callback is not None:
+                    callback(result)
+        finally:
+            self.poll_job = self.after(DB_POLL_MS, self.poll_db_results)
+        
+    def report_callback_exception(self, exc, val, tb):
+        """Tk hands any uncaught error from a callback here: print it and tell the user"""
+        traceback.print_exception(exc, val, tb)
+        messagebox.showerror("Unexpected Error", f"{exc.__name__}: {val}")
+        
+    def on_close(self):
+        """Let queued writes finish, then close both connections and the window"""
+        self.after_cancel(self.poll_job)
+        self.db_queue.put(None)
+        self.read_queue.put(None)
+        self.db_thread.join()
+        self.read_thread.join()
+        self.conn.close()
+        self.read_conn.close()
+        self.destroy()
+        
     def setup_styles(self):
         """Configure styles for a modern look"""
         style = ttk.Style()
         style.theme_use('clam') # Use a more modern-looking theme
 
-        # --- Color Palette ---
-        BG_PRIMARY = "#2c3e50"   # Dark Slate Blue (for main menu)
-        BG_CONTENT = "#ecf0f1"   # Light Gray (for content pages)
-        TEXT_LIGHT = "#FFFFFF"   # White
-        TEXT_DARK = "#34495e"    # Dark Gray
-        TEXT_HEADER = "#3498db"  # Bright Blue (for headers)
-        BTN_PRIMARY = "#3498db"  # Blue
-        BTN_SUCCESS = "#2ecc71"  # Green
-        BTN_DANGER = "#e74c3c"   # Red
-        BTN_BACK = "#bdc3c7"     # Silver
-        BTN_BACK_FG = "#2c3e50"  # Dark text for back button
-
-        # --- Configure Styles ---
-        style.configure('.', 
-                        background=BG_CONTENT, 
-                        foreground=TEXT_DARK, 
-                        font=('Inter', 11))
-        
-        style.configure('TFrame', background=BG_CONTENT)
-        style.configure('Content.TFrame', background=BG_CONTENT, relief='flat')
-        style.configure('Dark.TFrame', background=BG_PRIMARY) # For Main Menu
-
-        style.configure('TLabel', background=BG_CONTENT, padding=5)
-        style.configure('Dark.TLabel', background=BG_PRIMARY, foreground=TEXT_LIGHT, padding=5)
-        
-        style.configure('Header.TLabel', 
-                        font=('Inter', 26, 'bold'), 
-                        foreground=TEXT_HEADER, 
-                        background=BG_CONTENT, 
-                        padding=(10, 20, 10, 10))
-                        
-        style.configure('DarkHeader.TLabel', 
-                        font=('Inter', 32, 'bold'), 
-                        foreground=TEXT_LIGHT, 
-                        background=BG_PRIMARY, 
-                        padding=(10, 30))
-
-        style.configure('TButton', 
-                        font=('Inter', 12, 'bold'), 
-                        padding=(15, 12), 
-                        width=25,
-                        background=BTN_PRIMARY, 
-                        foreground=TEXT_LIGHT)
-        style.map('TButton', 
-                  background=[('active', '#2980b9')]) # Darker blue on hover/click
-
-        style.configure('Success.TButton', 
-                        background=BTN_SUCCESS, 
-                        foreground=TEXT_LIGHT)
-        style.map('Success.TButton', 
-                  background=[('active', '#27ae60')])
-
-        style.configure('Danger.TButton', 
-                        background=BTN_DANGER, 
-                        foreground=TEXT_LIGHT)
-        style.map('Danger.TButton', 
-                  background=[('active', '#c0392b')])
-        
-        style.configure('Back.TButton', 
-                        background=BTN_BACK, 
-                        foreground=BTN_BACK_FG, 
-                        width=15)
-        style.map('Back.TButton', 
-                  background=[('active', '#aab1b5')])
-        
-        style.configure('TEntry', 
-                        fieldbackground='white', 
-                        font=('Inter', 12), 
-                        padding=8)
-        
-        style.configure('Treeview.Heading', 
-                        font=('Inter', 13, 'bold'), 
-                        padding=10)
-        style.configure('Treeview', 
-                        font=('Inter', 11), 
-                        rowheight=30, 
-                        fieldbackground='white')
-        style.map('Treeview', 
-                  background=[('selected', BTN_PRIMARY)]) # Selected row color
-
-
-# --- Page 1: Main Menu (Responsive & Centered) ---
-class MainMenuFrame(ttk.Frame):
-    def __init__(self, parent, controller):
-        super().__init__(parent, style='Dark.TFrame') # Use dark background
-        self.controller = controller
-        
-        # --- Responsive Grid Layout ---
-        # Configure rows/columns to center the content
-        self.grid_rowconfigure(0, weight=2) # Empty space above
-        self.grid_rowconfigure(1, weight=1) # Title
-        self.grid_rowconfigure(2, weight=2) # Button Frame
-        self.grid_rowconfigure(3, weight=1) # Exit Button
-        self.grid_rowconfigure(4, weight=2) # Empty space below
-        
-        self.grid_columnconfigure(0, weight=1) # Empty space left
-        self.grid_columnconfigure(1, weight=0) # Content
-        self.grid_columnconfigure(2, weight=1) # Empty space right
-        
-        ttk.Label(self, text="Library Management System", 
-                  style='DarkHeader.TLabel').grid(row=1, column=1, pady=20)
-        
-        btn_frame = ttk.Frame(self, style='Dark.TFrame')
-        btn_frame.grid(row=2, column=1)
-        
-        buttons = [
-            ("View & Manage Books", ViewBooksFrame),
-            ("Add New Book", AddBookFrame),
-            ("Issue a Book", IssueBookFrame),
-            ("Return a Book", ReturnBookFrame),
-            ("View Full Issue History", ViewIssuedBooksFrame)
-        ]
-        
-        for i, (text, frame_class) in enumerate(buttons):
-            ttk.Button(btn_frame, text=text, 
-                       command=lambda fc=frame_class: controller.show_frame(fc)
-                       ).pack(fill='x', pady=12)
-            
-        ttk.Button(self, text="Exit Application", 
-                   style='Danger.TButton', 
-                   width=25,
-                   command=controller.destroy).grid(row=3, column=1, pady=40)
+        for name, options in STYLES.items():
+            style.configure(name, **options)
+        for name, options in STYLE_MAPS.items():
+            style.map(name, **options)
 
 
 # --- Base Page for Content (Forms, Tables) ---
@@ -238,12 +454,109 @@ class ContentFrame(ttk.Frame):
         # Child classes will create and place self.main_content_frame
         self.main_content_frame = ttk.Frame(self, style='Content.TFrame')
         self.main_content_frame.grid(row=1, column=0, sticky='nsew', padx=20, pady=10)
+        # Filled in by the subclass's build_body(), run by show_frame on first show
+        self.built = False
+
+    def ensure_built(self):
+        if not self.built:
+            self.build_body()
+            self.built = True
+
+    def report(self, result, **options):
+        """Show a background DB job's outcome() in the matching message box; returns whether it succeeded"""
+        show = {"info": messagebox.showinfo,
+                "warning": messagebox.showwarning,
+                "error": messagebox.showerror}[result["level"]]
+        show(result["title"], result["msg"], **options)
+        return result["ok"]
+
+    # --- Paged tables ---
+    # A paged tree starts with one page of rows and appends the next page whenever
+    # it is scrolled to the bottom (scrollbar, mouse wheel, PageDown or End).
+    # Pages are fetched on the reader thread and inserted when they come back.
+    def setup_paging(self, tree, scrollbar, fetch_page):
+        """fetch_page(conn, limit, last_row, *query) runs on the reader thread and
+        must return an iterable of row tuples: the first page when last_row is None,
+        otherwise the rows that sort after the last row already loaded. query is
+        whatever was passed to reload_pages(). It must not touch any widget or
+        other state the Tk thread may change"""
+        self.paged_tree = tree
+        self.paged_scrollbar = scrollbar
+        self.fetch_page = fetch_page
+        self.page_last = None
+        self.page_query = ()
+        self.has_more_pages = False
+        self.page_job = None
+        self.page_loading = False
+        # Bumped on every reload, so a page fetched for the old contents is dropped
+        self.page_generation = 0
+        tree.configure(yscrollcommand=self.on_paged_scroll)
+
+    def reload_pages(self, *query):
+        """Empty the paged tree and load its first page; query (e.g. a search
+        pattern) goes to fetch_page with every page of this load"""
+        if self.page_job is not None:
+            self.after_cancel(self.page_job)
+        self.page_generation += 1
+        children = self.paged_tree.get_children()
+        if children: self.paged_tree.delete(*children)
+        # Placeholder row until the first page arrives
+        self.paged_tree.insert("", "end", iid="loading", values=("", "Loading..."))
+        self.page_last = None
+        self.page_query = query
+        self.load_next_page()
+
+    def load_next_page(self):
+        self.page_job = None
+        self.page_loading = True
+        self.controller.run_read(self.fetch_page_db, (PAGE_SIZE, self.page_last, *self.page_query),
+                                 partial(self.show_page, self.page_generation))
+
+    def fetch_page_db(self, conn, limit, last_row, *query):
+        """Runs on the reader thread"""
+        try:
+            return list(self.fetch_page(conn, limit, last_row, *query)), None
+        except sqlite3.DatabaseError as e:
+            return [], outcome("error", "Database Error", f"An error occurred: {e}")
+
+    def show_page(self, generation, result):
+        if generation != self.page_generation:
+            return
+        rows, failure = result
+        self.page_loading = False
+        if self.paged_tree.exists("loading"):
+            self.paged_tree.delete("loading")
+        if failure is not None:
+            self.report(failure)
+        # Rows are ready-made tuples, so the loop is nothing but Tcl inserts; the
+        # tree lays out and redraws once, when the loop hands control back to Tk
+        insert = self.paged_tree.insert
+        for row in rows:
+            insert("", "end", values=row)
+        if rows:
+            self.page_last = rows[-1]
+        self.has_more_pages = len(rows) == PAGE_SIZE
+
+    def on_paged_scroll(self, first, last):
+        self.paged_scrollbar.set(first, last)
+        # Only once the tree is on screen, otherwise an unsized tree reports
+        # (0, 1) and would pull in every page
+        if (self.has_more_pages and self.page_job is None and not self.page_loading
+                and float(last) >= 1.0 and self.paged_tree.winfo_ismapped()):
+            self.page_job = self.after_idle(self.load_next_page)
+
+    def focused_row(self):
+        """The paged tree's focused item, or "" if none; the "Loading..."
+        placeholder can be clicked but is not a row"""
+        selected_item = self.paged_tree.focus()
+        return "" if selected_item == "loading" else selected_item
 
 # --- Page 2: Add New Book (Responsive Form) ---
 class AddBookFrame(ContentFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, controller, "Add New Book")
-        
+
+    def build_body(self):
         # --- Responsive Grid for the content area ---
         # This will center the form
         self.main_content_frame.grid_columnconfigure(0, weight=1)
@@ -270,8 +583,9 @@ class AddBookFrame(ContentFrame):
         self.quantity_entry = ttk.Entry(form_frame)
         self.quantity_entry.grid(row=2, column=1, padx=10, pady=8, sticky='ew')
         
-        ttk.Button(form_frame, text="Save Book", style='Success.TButton', 
-                   command=self.save_book).grid(row=3, column=1, sticky='e', padx=10, pady=20)
+        self.save_button = ttk.Button(form_frame, text="Save Book", style='Success.TButton', 
+                                      command=self.save_book)
+        self.save_button.grid(row=3, column=1, sticky='e', padx=10, pady=20)
 
     def save_book(self):
         title = self.title_entry.get().strip()
@@ -289,16 +603,24 @@ class AddBookFrame(ContentFrame):
             messagebox.showwarning("Input Error", "Quantity must be a positive number.")
             return
 
+        # Off until the insert reports back, so a quick second click can't add the book twice
+        self.save_button.state(['disabled'])
+        self.controller.run_db(self.save_book_db, (title, author, qty), self.save_book_done)
+
+    def save_book_db(self, conn, title, author, qty):
+        """Runs on the DB worker"""
         try:
-            conn = sqlite3.connect("library.db")
-            cur = conn.cursor()
-            cur.execute("INSERT INTO books (title, author, quantity) VALUES (?, ?, ?)", (title, author, qty))
-            conn.commit()
-            conn.close()
-            messagebox.showinfo("Success", "Book added successfully!")
+            conn.execute(SQL_INSERT_BOOK, (title, author, qty))
+            return outcome("info", "Success", "Book added successfully!")
+        except sqlite3.DatabaseError as e:
+            return outcome("error", "Database Error", f"An error occurred: {e}")
+
+    def save_book_done(self, result):
+        self.save_button.state(['!disabled'])
+        if result["ok"]:
+            self.controller.mark_dirty(ViewBooksFrame)
+        if self.report(result):
             self.refresh() # Clear fields
-        except Exception as e:
-            messagebox.showerror("Database Error", f"An error occurred: {e}")
 
     def refresh(self):
         """Clear all entry fields"""
@@ -312,7 +634,8 @@ class AddBookFrame(ContentFrame):
 class ViewBooksFrame(ContentFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, controller, "View & Manage Books")
-        
+
+    def build_body(self):
         # --- Responsive Grid for the content area ---
         self.main_content_frame.grid_rowconfigure(0, weight=0) # Search
         self.main_content_frame.grid_rowconfigure(1, weight=1) # Treeview
@@ -327,10 +650,17 @@ class ViewBooksFrame(ContentFrame):
         ttk.Label(search_frame, text="Search by Title:").grid(row=0, column=0, padx=(0, 5))
         self.search_entry = ttk.Entry(search_frame)
         self.search_entry.grid(row=0, column=1, sticky='ew', padx=5)
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
+        self.search_job = None
+        self.loaded_search = None # (text, match_anywhere) currently in the table
+        # Off: titles starting with the text (index seek). On: text anywhere in the title (full scan)
+        self.match_anywhere = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Match anywhere", variable=self.match_anywhere,
+                        command=self.search_action).grid(row=0, column=2, padx=5)
         ttk.Button(search_frame, text="Search", width=10,
-                   command=self.search_action).grid(row=0, column=2, padx=5)
+                   command=self.search_action).grid(row=0, column=3, padx=5)
         ttk.Button(search_frame, text="Refresh", style='Back.TButton', width=10,
-                   command=self.refresh).grid(row=0, column=3, padx=5)
+                   command=self.refresh).grid(row=0, column=4, padx=5)
 
         # --- Treeview Table ---
         tree_frame = ttk.Frame(self.main_content_frame)
@@ -352,7 +682,7 @@ class ViewBooksFrame(ContentFrame):
         self.tree.column("Quantity", width=80, anchor='center')
         
         scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
+        self.setup_paging(self.tree, scrollbar, self.fetch_books_page)
         
         scrollbar.grid(row=0, column=1, sticky='ns')
         self.tree.grid(row=0, column=0, sticky='nsew')
@@ -361,39 +691,66 @@ class ViewBooksFrame(ContentFrame):
         action_frame = ttk.Frame(self.main_content_frame)
         action_frame.grid(row=2, column=0, sticky='ew', pady=10)
         
-        ttk.Button(action_frame, text="Update Selected", width=18, 
-                   command=self.open_update_window).pack(side='left', padx=5)
+        self.update_button = ttk.Button(action_frame, text="Update Selected", width=18, 
+                                        command=self.open_update_window)
+        self.update_button.pack(side='left', padx=5)
         ttk.Button(action_frame, text="Delete Selected", style='Danger.TButton', width=18, 
                    command=self.delete_selected).pack(side='left', padx=5)
 
-        self.refresh() # Load data on init
-
     def load_books(self, filter_text=""):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        try:
-            conn = sqlite3.connect("library.db")
-            cur = conn.cursor()
-            if filter_text:
-                cur.execute("SELECT * FROM books WHERE title LIKE ? ORDER BY title", (f"%{filter_text}%",))
+        self.loaded_search = (filter_text, self.match_anywhere.get())
+        # Built here on the Tk thread (the reader thread may not read the checkbox)
+        # and handed to every page job of this search
+        pattern, low, high = None, None, None
+        if filter_text:
+            pattern = like_escape(filter_text) + "%"
+            if self.match_anywhere.get():
+                pattern = "%" + pattern
             else:
-                cur.execute("SELECT * FROM books ORDER BY title")
-            for row in cur.fetchall():
-                self.tree.insert("", "end", values=row)
-            conn.close()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"An error occurred: {e}")
+                low, high = prefix_bounds(filter_text)
+        self.reload_pages(pattern, low, high)
+
+    def fetch_books_page(self, conn, limit, last_row, pattern, low, high):
+        if last_row is None:
+            if high is not None:
+                return conn.execute(SQL_BOOKS_PREFIX_PAGE, (pattern, low, high, limit))
+            if pattern:
+                return conn.execute(SQL_BOOKS_SEARCH_PAGE, (pattern, limit))
+            return conn.execute(SQL_BOOKS_PAGE, (limit,))
+        book_id, title = last_row[0], last_row[1]
+        if high is not None:
+            return conn.execute(SQL_BOOKS_PREFIX_PAGE_AFTER,
+                                (pattern, title, title, book_id, high, limit))
+        if pattern:
+            return conn.execute(SQL_BOOKS_SEARCH_PAGE_AFTER, (pattern, title, title, book_id, limit))
+        return conn.execute(SQL_BOOKS_PAGE_AFTER, (title, title, book_id, limit))
+
+    def schedule_search(self, event=None):
+        """Debounce typing: search once the user pauses for SEARCH_DELAY_MS"""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DELAY_MS, self.search_action)
 
     def search_action(self):
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+            self.search_job = None
         query = self.search_entry.get().strip()
+        # The table already holds this search's rows (e.g. the key released
+        # was an arrow or Shift): keep them instead of querying again
+        if (query, self.match_anywhere.get()) == self.loaded_search:
+            return
         self.load_books(query)
 
     def refresh(self):
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+            self.search_job = None
         self.search_entry.delete(0, 'end')
         self.load_books()
         
     def delete_selected(self):
-        selected_item = self.tree.focus()
+        selected_item = self.focused_row()
         if not selected_item:
             messagebox.showwarning("No Selection", "Please select a book to delete.")
             return
@@ -404,29 +761,60 @@ class ViewBooksFrame(ContentFrame):
             f"Are you sure you want to delete '{book_title}' (ID: {book_id})?")
         
         if confirm:
-            try:
-                conn = sqlite3.connect("library.db")
-                cur = conn.cursor()
-                cur.execute("SELECT * FROM issued_books WHERE book_id = ? AND return_date IS NULL", (book_id,))
-                if cur.fetchone():
-                    messagebox.showerror("Error", "Cannot delete book. It is currently issued.")
-                else:
-                    cur.execute("DELETE FROM books WHERE id = ?", (book_id,))
-                    conn.commit()
-                    messagebox.showinfo("Deleted", "Book deleted successfully.")
-                    self.refresh()
-            except Exception as e:
-                messagebox.showerror("Database Error", f"An error occurred: {e}")
-            finally:
-                conn.close()
+            self.controller.run_db(self.delete_book_db, (book_id,), self.delete_book_done)
+
+    def delete_book_db(self, conn, book_id):
+        """Runs on the DB worker"""
+        try:
+            issued, qty = conn.execute(SQL_BOOK_STATUS, (book_id, book_id)).fetchone()
+            if qty is None:
+                return outcome("warning", "Not Found", "This book no longer exists.")
+            if issued:
+                return outcome("error", "Error", "Cannot delete book. It is currently issued.")
+            conn.execute(SQL_DELETE_BOOK, (book_id,))
+            return outcome("info", "Deleted", "Book deleted successfully.")
+        except sqlite3.IntegrityError:
+            # foreign_keys=ON: past issue records still point at this book
+            return outcome("error", "Error", "Cannot delete book. It has issue history.")
+        except sqlite3.DatabaseError as e:
+            return outcome("error", "Database Error", f"An error occurred: {e}")
+
+    def delete_book_done(self, result):
+        self.report(result)
+        # Reload after a delete, and after finding the row was already gone
+        if result["level"] != "error":
+            self.refresh()
 
     def open_update_window(self):
-        selected_item = self.tree.focus()
+        selected_item = self.focused_row()
         if not selected_item:
             messagebox.showwarning("No Selection", "Please select a book to update.")
             return
-        book_data = self.tree.item(selected_item, 'values')
-        book_id, title, author, qty = book_data
+        book_id = self.tree.item(selected_item, 'values')[0]
+        # Edit the stored row rather than what the table showed when it was loaded.
+        # Read on the reader thread: the write worker's connection may be midway
+        # through a transaction that is about to roll back
+        self.update_button.state(['disabled'])
+        self.controller.run_read(self.book_row_db, (book_id,), partial(self.show_update_window, book_id))
+
+    def book_row_db(self, conn, book_id):
+        """Runs on the reader thread"""
+        try:
+            return conn.execute(SQL_BOOK_ROW, (book_id,)).fetchone(), None
+        except sqlite3.DatabaseError as e:
+            return None, outcome("error", "Database Error", f"An error occurred: {e}")
+
+    def show_update_window(self, book_id, result):
+        self.update_button.state(['!disabled'])
+        book, failure = result
+        if failure is not None:
+            self.report(failure)
+            return
+        if not book:
+            messagebox.showwarning("Not Found", "This book no longer exists.")
+            self.refresh()
+            return
+        title, author, qty = book
 
         self.upd_win = tk.Toplevel(self.controller)
         self.upd_win.title("Update Book")
@@ -454,9 +842,9 @@ class ViewBooksFrame(ContentFrame):
         self.qty_entry_upd.grid(row=2, column=1, padx=10, pady=8, sticky='ew')
         self.qty_entry_upd.insert(0, qty)
         
-        save_btn = ttk.Button(form_frame, text="Save Changes", style='Success.TButton', width=15,
-            command=lambda: self.save_update(book_id))
-        save_btn.grid(row=3, column=1, sticky='e', pady=20, padx=10)
+        self.save_update_button = ttk.Button(form_frame, text="Save Changes", style='Success.TButton',
+            width=15, command=lambda: self.save_update(book_id))
+        self.save_update_button.grid(row=3, column=1, sticky='e', pady=20, padx=10)
 
     def save_update(self, book_id):
         title = self.title_entry_upd.get().strip()
@@ -472,24 +860,40 @@ class ViewBooksFrame(ContentFrame):
         except ValueError:
             messagebox.showwarning("Input Error", "Quantity must be a positive number.", parent=self.upd_win)
             return
+        self.save_update_button.state(['disabled'])
+        # The reply goes to this dialog; by then it may be closed, or another one open
+        self.controller.run_db(self.save_update_db, (title, author, qty, book_id),
+                               partial(self.save_update_done, self.upd_win, self.save_update_button))
+
+    def save_update_db(self, conn, title, author, qty, book_id):
+        """Runs on the DB worker"""
         try:
-            conn = sqlite3.connect("library.db")
-            cur = conn.cursor()
-            cur.execute("UPDATE books SET title = ?, author = ?, quantity = ? WHERE id = ?",
-                        (title, author, qty, book_id))
-            conn.commit()
-            conn.close()
-            messagebox.showinfo("Success", "Book updated successfully.")
-            self.upd_win.destroy()
+            conn.execute(SQL_UPDATE_BOOK, (title, author, qty, book_id))
+            return outcome("info", "Success", "Book updated successfully.")
+        except sqlite3.DatabaseError as e:
+            return outcome("error", "Database Error", f"An error occurred: {e}")
+
+    def save_update_done(self, window, button, result):
+        # The user may have closed the update window while the job ran
+        is_open = window.winfo_exists()
+        if result["ok"]:
+            # This page reloads itself below; the issue lists show the title too
+            self.controller.mark_dirty(ReturnBookFrame, ViewIssuedBooksFrame)
+            self.report(result)
+            if is_open:
+                window.destroy()
             self.refresh()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"An error occurred: {e}", parent=self.upd_win)
+        else:
+            if is_open:
+                button.state(['!disabled'])
+            self.report(result, parent=window if is_open else self)
 
 # --- Page 4: Issue a Book (Responsive Form) ---
 class IssueBookFrame(ContentFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, controller, "Issue a Book")
-        
+
+    def build_body(self):
         # --- Responsive Grid for the content area ---
         self.main_content_frame.grid_columnconfigure(0, weight=1)
         self.main_content_frame.grid_columnconfigure(1, weight=1) # Form
@@ -528,54 +932,54 @@ class IssueBookFrame(ContentFrame):
             messagebox.showwarning("Input Error", "Book ID and Student Roll No are required!")
             return
 
+        self.controller.run_db(self.issue_book_db, (book_id, sroll, sname), self.issue_book_done)
+
+    def issue_book_db(self, conn, book_id, sroll, sname):
+        """Runs on the DB worker"""
         try:
-            conn = sqlite3.connect("library.db")
-            cur = conn.cursor()
-
-            # 1. Check book availability
-            cur.execute("SELECT quantity FROM books WHERE id = ?", (book_id,))
-            book = cur.fetchone()
-            if not book:
-                messagebox.showwarning("Error", "Book ID not found.")
-                conn.close(); return
-            if book[0] <= 0:
-                messagebox.showwarning("Unavailable", "No copies of this book are left to issue.")
-                conn.close(); return
-
-            # 2. Find or create student
-            cur.execute("SELECT id, name FROM students WHERE roll_no = ?", (sroll,))
-            student = cur.fetchone()
-            if not student:
-                if not sname:
-                    messagebox.showwarning("Input Error", "Student Name is required for new students.")
-                    conn.close(); return
-                cur.execute("INSERT INTO students (name, roll_no) VALUES (?, ?)", (sname, sroll))
-                conn.commit()
-                student_id, student_name = cur.lastrowid, sname
+            # One write transaction for the whole flow: a single commit on success,
+            # and nothing (not even a new student) is kept if a check fails
+            conn.execute("BEGIN IMMEDIATE")
+
+            # 1. Take a copy if one is left (rolled back below if a later check fails)
+            if not conn.execute(SQL_TAKE_COPY, (book_id,)).fetchone():
+                # Rare path: find out which message applies
+                found = conn.execute(SQL_BOOK_EXISTS, (book_id,)).fetchone()
+                conn.execute("ROLLBACK")
+                if not found:
+                    return outcome("warning", "Error", "Book ID not found.")
+                return outcome("warning", "Unavailable", "No copies of this book are left to issue.")
+
+            # 2. Find or create student. With a name this is one upsert; the name
+            # is only used for a new student, an existing one keeps theirs
+            if sname:
+                student = conn.execute(SQL_UPSERT_STUDENT, (sname, sroll)).fetchone()
             else:
-                student_id, student_name = student[0], student[1]
+                student = conn.execute(SQL_FIND_STUDENT, (sroll,)).fetchone()
+                if not student:
+                    conn.execute("ROLLBACK")
+                    return outcome("warning", "Input Error", "Student Name is required for new students.")
+            student_id, student_name = student
 
             # 3. Check if student already has this book
-            cur.execute("SELECT * FROM issued_books WHERE book_id = ? AND student_id = ? AND return_date IS NULL", 
-                        (book_id, student_id))
-            if cur.fetchone():
-                messagebox.showwarning("Already Issued", f"{student_name} already has a copy of this book.")
-                conn.close(); return
+            if conn.execute(SQL_ALREADY_ISSUED, (book_id, student_id)).fetchone():
+                conn.execute("ROLLBACK")
+                return outcome("warning", "Already Issued", f"{student_name} already has a copy of this book.")
 
             # 4. Record issue
-            cur.execute("INSERT INTO issued_books (book_id, student_id, issue_date) VALUES (?, ?, ?)",
-                        (book_id, student_id, str(date.today())))
-            
-            # 5. Decrement book quantity
-            cur.execute("UPDATE books SET quantity = quantity - 1 WHERE id = ?", (book_id,))
+            conn.execute(SQL_INSERT_ISSUE, (book_id, student_id, date.today().isoformat()))
             
-            conn.commit()
-            messagebox.showinfo("Issued", f"Book ID {book_id} issued to {student_name} (Roll: {sroll})!")
+            conn.execute("COMMIT")
+            return outcome("info", "Issued", f"Book ID {book_id} issued to {student_name} (Roll: {sroll})!")
+        except sqlite3.DatabaseError as e:
+            if conn.in_transaction: conn.rollback()
+            return outcome("error", "Database Error", f"An error occurred: {e}")
+
+    def issue_book_done(self, result):
+        if result["ok"]:
+            self.controller.mark_dirty(ViewBooksFrame, ReturnBookFrame, ViewIssuedBooksFrame)
+        if self.report(result):
             self.refresh()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"An error occurred: {e}")
-        finally:
-            if conn: conn.close()
 
     def refresh(self):
         self.book_id_entry.delete(0, 'end')
@@ -588,7 +992,8 @@ class IssueBookFrame(ContentFrame):
 class ReturnBookFrame(ContentFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, controller, "Return a Book")
-        
+
+    def build_body(self):
         # --- Responsive Grid for the content area ---
         self.main_content_frame.grid_rowconfigure(0, weight=0) # Note
         self.main_content_frame.grid_rowconfigure(1, weight=1) # Treeview
@@ -621,7 +1026,7 @@ class ReturnBookFrame(ContentFrame):
         self.tree.column("Book ID", width=0, stretch=tk.NO) # Hide Book ID
         
         scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
+        self.setup_paging(self.tree, scrollbar, self.fetch_issued_page)
         scrollbar.grid(row=0, column=1, sticky='ns')
         self.tree.grid(row=0, column=0, sticky='nsew')
 
@@ -634,62 +1039,63 @@ class ReturnBookFrame(ContentFrame):
         ttk.Button(action_frame, text="Refresh List", style='Back.TButton', width=15, 
                    command=self.refresh).pack(side='left', padx=5)
 
+    def fetch_issued_page(self, conn, limit, last_row):
+        if last_row is None:
+            return conn.execute(SQL_ACTIVE_ISSUES, (limit,))
+        issue_id, issue_date = last_row[0], last_row[4]
+        return conn.execute(SQL_ACTIVE_ISSUES_AFTER, (issue_date, issue_date, issue_id, limit))
+
     def load_issued_books(self):
-        for i in self.tree.get_children(): self.tree.delete(i)
-        try:
-            conn = sqlite3.connect("library.db")
-            cur = conn.cursor()
-            query = """
-                SELECT i.id, b.title, s.name, s.roll_no, i.issue_date, i.book_id
-                FROM issued_books i
-                JOIN books b ON i.book_id = b.id
-                JOIN students s ON i.student_id = s.id
-                WHERE i.return_date IS NULL
-                ORDER BY i.issue_date
-            """
-            cur.execute(query)
-            for row in cur.fetchall():
-                self.tree.insert("", "end", values=row)
-            conn.close()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"An error occurred: {e}")
+        # Books still out, one page at a time as the list is scrolled
+        self.reload_pages()
 
     def refresh(self):
         self.load_issued_books()
 
     def return_book(self):
-        selected_item = self.tree.focus()
+        selected_item = self.focused_row()
         if not selected_item:
             messagebox.showwarning("No Selection", "Please select an issued book to return.")
             return
             
         data = self.tree.item(selected_item, 'values')
-        issue_id, book_title, student_name, book_id = data[0], data[1], data[2], data[5]
+        issue_id, book_title, student_name = data[0], data[1], data[2]
         
         confirm = messagebox.askyesno("Confirm Return", 
             f"Return '{book_title}' from {student_name}?")
         
         if confirm:
-            try:
-                conn = sqlite3.connect("library.db")
-                cur = conn.cursor()
-                cur.execute("UPDATE issued_books SET return_date = ? WHERE id = ?", 
-                            (str(date.today()), issue_id))
-                cur.execute("UPDATE books SET quantity = quantity + 1 WHERE id = ?", (book_id,))
-                conn.commit()
-                messagebox.showinfo("Success", "Book returned successfully.")
-                self.refresh()
-            except Exception as e:
-                messagebox.showerror("Database Error", f"An error occurred: {e}")
-            finally:
-                conn.close()
+            self.controller.run_db(self.return_book_db, (issue_id,), self.return_book_done)
+
+    def return_book_db(self, conn, issue_id):
+        """Runs on the DB worker"""
+        try:
+            # Both updates land together or not at all; the book id comes from the
+            # issue row itself, and an issue that is already closed changes nothing
+            with transaction(conn):
+                returned = conn.execute(SQL_RETURN_UPDATE_ISSUE, (date.today().isoformat(), issue_id)).fetchone()
+                if returned is None:
+                    return outcome("warning", "Already Returned", "This book has already been returned.")
+                conn.execute(SQL_RETURN_INC_QTY, returned)
+            return outcome("info", "Success", "Book returned successfully.")
+        except sqlite3.DatabaseError as e:
+            return outcome("error", "Database Error", f"An error occurred: {e}")
+
+    def return_book_done(self, result):
+        if result["ok"]:
+            self.controller.mark_dirty(ViewBooksFrame, ViewIssuedBooksFrame)
+        self.report(result)
+        # Reload after a return, and after finding it was already returned
+        if result["level"] != "error":
+            self.refresh()
 
 
 # --- Page 6: View Full Issue History (Responsive Table) ---
 class ViewIssuedBooksFrame(ContentFrame):
     def __init__(self, parent, controller):
         super().__init__(parent, controller, "Full Issue History")
-        
+
+    def build_body(self):
         # --- Responsive Grid for the content area ---
         self.main_content_frame.grid_rowconfigure(0, weight=1) # Treeview
         self.main_content_frame.grid_rowconfigure(1, weight=0) # Actions
@@ -718,7 +1124,7 @@ class ViewIssuedBooksFrame(ContentFrame):
         self.tree.column("Returned", width=110, anchor='center')
         
         scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
+        self.setup_paging(self.tree, scrollbar, self.fetch_history_page)
         scrollbar.grid(row=0, column=1, sticky='ns')
         self.tree.grid(row=0, column=0, sticky='nsew')
 
@@ -727,34 +1133,77 @@ class ViewIssuedBooksFrame(ContentFrame):
         action_frame.grid(row=1, column=0, sticky='ew', pady=10)
         
         ttk.Button(action_frame, text="Refresh List", style='Back.TButton', width=15, 
-                   command=self.refresh).pack(side='left', padx=5)
+                   command=self.schedule_refresh).pack(side='left', padx=5)
+        self.refresh_job = None
+
+    def fetch_history_page(self, conn, limit, last_row):
+        # The query fills in "Not Returned" itself, so its rows go straight into the tree
+        if last_row is None:
+            return conn.execute(SQL_HISTORY_SELECT, (limit,))
+        issue_id, issue_date = last_row[0], last_row[4]
+        return conn.execute(SQL_HISTORY_SELECT_AFTER, (issue_date, issue_date, issue_id, limit))
 
     def load_all_issued(self):
-        for i in self.tree.get_children(): self.tree.delete(i)
-        try:
-            conn = sqlite3.connect("library.db")
-            cur = conn.cursor()
-            query = """
-                SELECT i.id, b.title, s.name, s.roll_no, i.issue_date, i.return_date
-                FROM issued_books i
-                JOIN books b ON i.book_id = b.id
-                JOIN students s ON i.student_id = s.id
-                ORDER BY i.issue_date DESC
-            """
-            cur.execute(query)
-            for row in cur.fetchall():
-                display_row = list(row)
-                if display_row[5] is None:
-                    display_row[5] = "--- Not Returned ---"
-                self.tree.insert("", "end", values=display_row)
-            conn.close()
-        except Exception as e:
-            messagebox.showerror("Database Error", f"An error occurred: {e}")
+        # Newest issues first, one page at a time as the list is scrolled
+        self.reload_pages()
+
+    def schedule_refresh(self):
+        """Debounce the Refresh button: reload once the clicks stop for REFRESH_DELAY_MS"""
+        if self.refresh_job is not None:
+            self.after_cancel(self.refresh_job)
+        self.refresh_job = self.after(REFRESH_DELAY_MS, self.refresh)
 
     def refresh(self):
+        if self.refresh_job is not None:
+            self.after_cancel(self.refresh_job)
+            self.refresh_job = None
         self.load_all_issued()
 
 
+# --- Page 1: Main Menu (Responsive & Centered) ---
+# Defined after the content pages so BUTTONS can name their classes
+class MainMenuFrame(ttk.Frame):
+    BUTTONS = (
+        ("View & Manage Books", ViewBooksFrame),
+        ("Add New Book", AddBookFrame),
+        ("Issue a Book", IssueBookFrame),
+        ("Return a Book", ReturnBookFrame),
+        ("View Full Issue History", ViewIssuedBooksFrame),
+    )
+
+    def __init__(self, parent, controller):
+        super().__init__(parent, style='Dark.TFrame') # Use dark background
+        self.controller = controller
+        
+        # --- Responsive Grid Layout ---
+        # Configure rows/columns to center the content
+        self.grid_rowconfigure(0, weight=2) # Empty space above
+        self.grid_rowconfigure(1, weight=1) # Title
+        self.grid_rowconfigure(2, weight=2) # Button Frame
+        self.grid_rowconfigure(3, weight=1) # Exit Button
+        self.grid_rowconfigure(4, weight=2) # Empty space below
+        
+        self.grid_columnconfigure(0, weight=1) # Empty space left
+        self.grid_columnconfigure(1, weight=0) # Content
+        self.grid_columnconfigure(2, weight=1) # Empty space right
+        
+        ttk.Label(self, text="Library Management System", 
+                  style='DarkHeader.TLabel').grid(row=1, column=1, pady=20)
+        
+        btn_frame = ttk.Frame(self, style='Dark.TFrame')
+        btn_frame.grid(row=2, column=1)
+        
+        for text, frame_class in self.BUTTONS:
+            ttk.Button(btn_frame, text=text, 
+                       command=partial(controller.show_frame, frame_class)
+                       ).pack(fill='x', pady=12)
+            
+        ttk.Button(self, text="Exit Application", 
+                   style='Danger.TButton', 
+                   width=25,
+                   command=controller.on_close).grid(row=3, column=1, pady=40)
+
+
 # --- Run the Application ---
 if __name__ == "__main__":
     init_db()       # Setup the database first